@@ -3,9 +3,10 @@ import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
 from d3blocks import D3Blocks
+from CoAct_corpus_analysis.CoAct_corpus_plotting.figure_cache import get_figure_key, is_cached, record_figure
 
 
-def plot_cooccurrence_matrix(matrix, sa, out_dir):
+def plot_cooccurrence_matrix(matrix, sa, out_dir, use_cache=False):
 
     """
         Heatmap showing all the temporal co-occurrences between facial signals for ONE social action.
@@ -13,8 +14,17 @@ def plot_cooccurrence_matrix(matrix, sa, out_dir):
     Input:
 
         matrix: DataFrame with all the co-occurences of facial signals with each other.
+        sa: the social action abbreviation
+        out_dir: directory to save plot
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
     """
     
+    out_file = os.path.join(out_dir, f'{sa}_FS_matrix.png')
+    if use_cache:
+        key = get_figure_key('plot_cooccurrence_matrix', matrix, sa=sa, tiers=list(matrix.index))
+        if is_cached(out_file, key):
+            return
+    
     #melt upper triangle of matrix
     lower_matrix = matrix.where(np.tril(np.ones(matrix.shape)).astype(np.bool))
     
@@ -28,10 +38,13 @@ def plot_cooccurrence_matrix(matrix, sa, out_dir):
             
     ax.set_title(f'Co-occurrence of Facial Signals in {sa} questions')
     plt.tight_layout()
-    ax.get_figure().savefig(os.path.join(out_dir, f'{sa}_FS_matrix.png'))
+    ax.get_figure().savefig(out_file)
     plt.close()
+    
+    if use_cache:
+        record_figure(out_file, key)
 
-def plot_chord_diagram(matrix, sa, out_dir):
+def plot_chord_diagram(matrix, sa, out_dir, use_cache=False):
 
     """
         Chord diagram showing all the temporal co-occurrences between facial signals for ONE social action.
@@ -39,8 +52,17 @@ def plot_chord_diagram(matrix, sa, out_dir):
     Input:
 
         matrix: DataFrame with all the co-occurences of facial signals with each other.
+        sa: the social action abbreviation
+        out_dir: directory to save plot
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
     """
     
+    filepath = os.path.join(out_dir, f'{sa}_facial_actions_chord_plot.html')
+    if use_cache:
+        key = get_figure_key('plot_chord_diagram', matrix, sa=sa, tiers=list(matrix.index))
+        if is_cached(filepath, key):
+            return
+    
     d3 = D3Blocks(chart='Chord', frame=False)
 
     #melt upper triangle of matrix
@@ -51,5 +73,7 @@ def plot_chord_diagram(matrix, sa, out_dir):
     #exclude self references
     df = df[df['source'] != df['target']]
 
-    filepath = os.path.join(out_dir, f'{sa}_facial_actions_chord_plot.html')
     d3.chord(df, fontsize = 14, cmap = 'tab20', showfig = False, filepath=filepath)
+    
+    if use_cache:
+        record_figure(filepath, key)
@@ -4,8 +4,9 @@ import pandas as pd
 import numpy as np
 import os
 from collections import Counter
+from CoAct_corpus_analysis.CoAct_corpus_plotting.figure_cache import get_figure_key, is_cached, record_figure
 
-def plot_frequency(question_df, tier, sa, out_dir):
+def plot_frequency(question_df, tier, sa, out_dir, use_cache=False):
     """ 
         Barplot showing for ONE social action category/type all the associations with other social action categories/types.
 
@@ -14,8 +15,15 @@ def plot_frequency(question_df, tier, sa, out_dir):
         tier: whether to show associations with SA_categories or SA_types (if the social action is a category you want to see the association with types and vice versa)
         sa: the social action abbreviation
         out_dir: directory to save plot image
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
 
     """
+    out_file = os.path.join(out_dir, f'{sa}_{tier}_frequency.png')
+    if use_cache:
+        key = get_figure_key('plot_frequency', question_df[[tier]], tier=tier, sa=sa)
+        if is_cached(out_file, key):
+            return
+
     sns.set_style("whitegrid")
     plt.figure()
     
@@ -34,13 +42,15 @@ def plot_frequency(question_df, tier, sa, out_dir):
     ax.set_ylabel("Occurrence (%)")
         
     ax.set_title(f'{tier} frequency of {sa} questions (n = {len(question_df)})')
-    out_file = os.path.join(out_dir, f'{sa}_{tier}_frequency.png')  
     ax.get_figure().savefig(out_file)
     plt.close("all")
+    
+    if use_cache:
+        record_figure(out_file, key)
 
 
 
-def plot_relative_onset(plotting_df, sa, tiers, out_dir):
+def plot_relative_onset(plotting_df, sa, tiers, out_dir, use_cache=False):
     """
         Density estimate for ONE social action category/type of the relative onset (Signal onset - Question onset) for each facial signal/gesture tier.
 
@@ -49,9 +59,16 @@ def plot_relative_onset(plotting_df, sa, tiers, out_dir):
         sa: the social action abbreviation
         tiers: facial signal/gesture tiers to show relative onset for
         out_dir: directory to save plot image
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
 
     """
 
+    out_file = os.path.join(out_dir, f'{sa}_relative_onset.png')
+    if use_cache:
+        key = get_figure_key('plot_relative_onset', plotting_df[['tier', 'onset_difference', 'overlap_label']], sa=sa, tiers=list(tiers))
+        if is_cached(out_file, key):
+            return
+
     sns.set_style("whitegrid")
     
     fig, axs = plt.subplots(len(tiers), 1, figsize=(10,25))
@@ -66,12 +83,15 @@ def plot_relative_onset(plotting_df, sa, tiers, out_dir):
         
     plt.suptitle(f'Onset of Facial Signals Relative to Question Onset for {sa} Questions')    
     plt.tight_layout()
-    plt.savefig(os.path.join(out_dir, f'{sa}_relative_onset.png'))
+    plt.savefig(out_file)
     plt.close("all")
+    
+    if use_cache:
+        record_figure(out_file, key)
 
 
 
-def plot_facial_signal_frequency(plotting_df, sa, out_dir):
+def plot_facial_signal_frequency(plotting_df, sa, out_dir, use_cache=False):
 
     """ 
         Barplot for ONE social action category/type showing the frequencies of overlapping facial signals
@@ -80,8 +100,15 @@ def plot_facial_signal_frequency(plotting_df, sa, out_dir):
         plotting_df: DataFrame as generated by using the plot_preprocessing functions
         sa: the social action abbreviation
         out_dir: directory to save plot image
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
     """
 
+    out_file = os.path.join(out_dir, f'{sa}_facial_signal_frequency.png')
+    if use_cache:
+        key = get_figure_key('plot_facial_signal_frequency', plotting_df[['overlap_label', 'tier']], sa=sa)
+        if is_cached(out_file, key):
+            return
+
     sns.set_style("whitegrid")
     
     #count amount of facial signal overlaps
@@ -107,16 +134,17 @@ def plot_facial_signal_frequency(plotting_df, sa, out_dir):
     
     ax.tick_params(axis='x', labelrotation=90)
     ax.set_title(f'Occurrences of Facial Signal Overlaps for {sa} questions')
-    
-    out_file = os.path.join(out_dir, f'{sa}_facial_signal_frequency.png')  
 
     plt.tight_layout()
     plt.savefig(out_file)
     plt.close("all")
+    
+    if use_cache:
+        record_figure(out_file, key)
 
 
 
-def plot_percentual_overlap(plotting_df, sa, out_dir):
+def plot_percentual_overlap(plotting_df, sa, out_dir, use_cache=False):
 
     """ 
     Boxplot for ONE social action category/type showing the relative amount of temporal overlap of facial signals
@@ -125,8 +153,14 @@ def plot_percentual_overlap(plotting_df, sa, out_dir):
         plotting_df: DataFrame as generated by using the plot_preprocessing functions
         sa: the social action abbreviation
         out_dir: directory to save plot image
+        use_cache: skip the plot if the figure in out_dir was already rendered from the same data and parameters
     """
 
+    out_file = os.path.join(out_dir, f'{sa}_Overlap_amounts.png')
+    if use_cache:
+        key = get_figure_key('plot_percentual_overlap', plotting_df[['overlap_prct', 'overlap_label', 'tier']], sa=sa)
+        if is_cached(out_file, key):
+            return
 
     sns.set_style("whitegrid")
 
@@ -149,7 +183,10 @@ def plot_percentual_overlap(plotting_df, sa, out_dir):
     ax.tick_params(axis='both', which='major', labelsize=12)
 
     plt.tight_layout()
-    plt.savefig(os.path.join(out_dir, f'{sa}_Overlap_amounts.png'))
+    plt.savefig(out_file)
     plt.close("all")
+    
+    if use_cache:
+        record_figure(out_file, key)
 
 
@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+import tempfile
+from datetime import datetime
+import pandas as pd
+
+"""
+    Content-addressed cache for the plotting functions. Each figure gets a key from its input data, its parameters and the package version.
+    The keys of rendered figures are recorded in an index file in the output directory, so a figure is only redrawn if its key changed
+    or the output file is missing.
+    The index is updated without a lock: if two scripts plot into the same out_dir at the same time, one of them may overwrite the
+    other's entries. The index file itself is never corrupted, and a lost entry only means that figure is drawn again next time.
+"""
+
+INDEX_FILE = 'figure_index.json'
+
+def get_package_version():
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return 'unknown'
+    try:
+        return version('CoAct_corpus_analysis')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+def _update_hash(h, value):
+    #DataFrames are hashed by content, everything else by its repr
+    #the row index is left out: slices of a corpus-wide frame shift their index whenever a row is added or removed earlier in the corpus
+    if isinstance(value, pd.DataFrame):
+        h.update(repr((list(value.columns), list(value.dtypes.astype(str)))).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+    else:
+        h.update(repr(value).encode('utf-8'))
+
+
+def get_figure_key(plot_name, data, **params):
+
+    """
+    Computes the cache key for one figure.
+
+    Input:
+        plot_name (str): name of the plotting function
+        data (pd.DataFrame): input data slice of the figure, hashed without its row index
+        params: all other parameters which change the figure, i.e. sa or tiers. Pass the index here if it is drawn (i.e. the tier labels of a matrix)
+
+    Returns:
+        key (str): sha256 hexdigest
+    """
+
+    h = hashlib.sha256()
+    _update_hash(h, (plot_name, get_package_version()))
+    _update_hash(h, data)
+    for name in sorted(params):
+        _update_hash(h, (name, params[name]))
+
+    return h.hexdigest()
+
+
+def load_index(out_dir):
+    #output filename -> entry with the key and render time
+    index_file = os.path.join(out_dir, INDEX_FILE)
+    if not os.path.isfile(index_file):
+        return {}
+    with open(index_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def is_cached(out_file, key):
+
+    """
+    True if `out_file` exists and was rendered from the same key.
+    """
+
+    if not os.path.isfile(out_file):
+        return False
+    entry = load_index(os.path.dirname(out_file)).get(os.path.basename(out_file))
+
+    return entry is not None and entry['key'] == key
+
+
+def record_figure(out_file, key):
+
+    """
+    Records the key of a rendered figure in the index file of its output directory.
+    """
+
+    out_dir = os.path.dirname(out_file)
+    index = load_index(out_dir)
+    index[os.path.basename(out_file)] = {'key': key, 'rendered': datetime.now().isoformat(timespec='seconds')}
+
+    #write to a unique temporary file first so an interrupted or concurrent run doesn't leave a broken index behind
+    fd, tmp_file = tempfile.mkstemp(prefix=INDEX_FILE, suffix='.tmp', dir=out_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=4, sort_keys=True)
+    os.replace(tmp_file, os.path.join(out_dir, INDEX_FILE))
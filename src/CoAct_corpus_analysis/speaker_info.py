@@ -1,8 +1,9 @@
 import pympi
-import json
 from datetime import date
-from CoAct_corpus_analysis.speaker_info_encoder import SpeakerInfoEncoder
+from CoAct_corpus_analysis.speaker_info_encoder import open_json_file, stream_json, write_jsonl
 from CoAct_corpus_analysis.utterance_info import UtteranceInfo
+from CoAct_corpus_analysis.tier_occupancy import rasterize_tiers, interval_overlap_durations
+from CoAct_corpus_analysis.tier_scanner import check_file
 
 class SpeakerInfo:
     
@@ -18,6 +19,21 @@ class SpeakerInfo:
         self.linked_file = linked_file
         self.questions = []
         self.responses = []
+    
+    def check_tiers(self, tierlist):
+        
+        """
+        Checks the TIER headers of the linked file for all the given tiers without parsing the annotations (see `tier_scanner.py`).
+        To check the whole corpus before an extraction run use `check_speakers()` from `tier_scanner.py` instead.
+
+        Input:
+            tierlist (list): full tiernames, i.e. ['Question_A', 'Gaze_A']
+        
+        Raises:
+            TierCheckError: If any of the tiers are not found in the linked file or the file can't be read, listing all of them at once.
+        """
+        
+        check_file(self.linked_file, tierlist)
                   
     def extract_utterances(self, tier):
         
@@ -154,16 +170,91 @@ class SpeakerInfo:
         return utterances     
     
      
-    def save_to_json(self, out_dir):
+    def extract_tier_timelines(self, tierlist, resolution=1):
+        
+        """
+        Rasterizes the given tiers of the linked file into boolean occupancy timelines (see `tier_occupancy.py`).
+
+        Input:
+            tierlist (list): tiernames to rasterize
+            resolution (float): bin size in ms, i.e. 1 or 1000/fps for the video frame rate
+        
+        Raises:
+            ValueError: If the linked file can't be loaded.
+            KeyError: If any of the tiers in `tierlist` are not found in the linked file.
+
+        Returns:
+            timelines (dict): tiername -> boolean occupancy array, all of the same length
+        """
+        
+        try:
+            eaf = pympi.Eaf(self.linked_file)
+        except:
+            raise ValueError(f'No ELAN file found for {self.dyad}_{self.condition}_{self.speaker_ID}, please provide valid file paths as linked_files.')
+        
+        try:
+            return rasterize_tiers(eaf, tierlist, resolution)
+        except KeyError as e:
+            raise KeyError(f'{e.args[0]}: {self.linked_file}')
+    
+    
+    def extract_utterance_overlap_amounts(self, utterances, tierlist, resolution=1):
+        
+        """
+        For each tier, computes the total overlap in ms with every utterance in one vectorized pass over the tier timeline.
+
+        Input:
+            utterances (list): UtteranceInfo objects
+            tierlist (list): tiernames to compute the overlap amounts for
+            resolution (float): bin size in ms
+        
+        Raises:
+            ValueError: If the linked file can't be loaded.
+            KeyError: If any of the tiers in `tierlist` are not found in the linked file.
+
+        Returns:
+            overlap_amounts (dict): tiername -> array of overlap durations in ms, in the same order as `utterances`
+        """
+        
+        timelines = self.extract_tier_timelines(tierlist, resolution)
+        intervals = [utterance.get_interval() for utterance in utterances]
+        
+        return {tier: interval_overlap_durations(intervals, timeline, resolution) for tier, timeline in timelines.items()}
+    
+     
+    def save_to_json(self, out_dir, compact=False, compress=False):
         
         """
         Saves complete speaker_inof object to a JSON file in the specified directory in the format: Dyad_Condition_Speaker_data.json.
+        The object is streamed to the file without building the encoded string in memory.
             
         Input:
             out_dir (str): path where to save the files 
+            compact (bool): write without indentation and whitespace
+            compress (bool): gzip the file, `.gz` is appended to the filename
+        """
+        out_file = out_dir + f'/{self.dyad}_{self.condition}_{self.speaker_ID}_data.json'
+        if compress:
+            out_file += '.gz'
+        
+        with open_json_file(out_file, 'w', compress) as f:
+            stream_json(self.__dict__, f, compact)
+    
+    
+    def save_to_jsonl(self, out_file, per_utterance=False, compress=False):
+        
+        """
+        Appends the speaker_info object to a corpus-level JSON Lines file, see `write_jsonl()` in `speaker_info_encoder.py`.
+            
+        Input:
+            out_file (str): path of the .jsonl file
+            per_utterance (bool): write one record per utterance instead of one for the whole speaker
+            compress (bool): gzip the output, `.gz` is appended to the filename if it's missing
+        
+        Returns:
+            out_file (str): path of the file that was written to
         """
-        with open(out_dir + f'/{self.dyad}_{self.condition}_{self.speaker_ID}_data.json', 'w', encoding='utf-8') as f:
-            json.dump(self.__dict__, f, cls=SpeakerInfoEncoder, ensure_ascii=False, indent=4)
+        return write_jsonl([self], out_file, per_utterance, compress)
                         
                         
     def set_questions(self, utterances):
@@ -1,5 +1,8 @@
+import re
 import json
+import gzip
 from CoAct_corpus_analysis.speaker_info import SpeakerInfo
+from CoAct_corpus_analysis.speaker_info_encoder import open_json_file
 from CoAct_corpus_analysis.utterance_info import UtteranceInfo
 
 
@@ -26,10 +29,7 @@ def decode_utterances(speaker_info_file, utterance_type):
     return utterance_objs
 
 
-def load_speaker_from_json(file):
-    
-    with open(file, 'r') as f:
-        speaker_info_file = json.load(f)
+def decode_speaker(speaker_info_file):
     
     #initialize object with info from dict 
     speaker_info_obj = SpeakerInfo(dyad = speaker_info_file['dyad'], 
@@ -44,4 +44,175 @@ def load_speaker_from_json(file):
     speaker_info_obj.set_questions(question_objs)
     speaker_info_obj.set_responses(response_objs)
         
-    return speaker_info_obj
\ No newline at end of file
+    return speaker_info_obj
+
+
+def load_speaker_from_json(file):
+    
+    #.json.gz files written with save_to_json(compress=True) are decompressed on the fly
+    with open_json_file(file, 'r') as f:
+        speaker_info_file = json.load(f)
+    
+    return decode_speaker(speaker_info_file)
+
+
+def _speaker_key(record):
+    return (record['dyad'], record['condition'], record['speaker_ID'])
+
+
+def _decode_utterance_record(record):
+    utterance_info_obj = UtteranceInfo(ID=record['ID'], 
+                                       interval=tuple(record['interval']))
+    utterance_info_obj.set_overlaps(record['overlaps'])
+    
+    return utterance_info_obj
+
+
+def decode_speaker_records(records):
+    
+    """
+    Builds one SpeakerInfo object from its JSON Lines records, either a single per-speaker record or all of its per-utterance records.
+    The empty record of a speaker without utterances (`utterance_type` None) gives a SpeakerInfo object without questions and responses.
+    """
+    
+    if 'utterance_type' not in records[0]:
+        return decode_speaker(records[0])
+    
+    speaker_info_obj = SpeakerInfo(dyad = records[0]['dyad'], 
+                                    speaker_ID = records[0]['speaker_ID'],
+                                    condition = records[0]['condition'],
+                                    linked_file = records[0]['linked_file'])
+    
+    speaker_info_obj.set_questions([_decode_utterance_record(r) for r in records if r['utterance_type'] == 'questions'])
+    speaker_info_obj.set_responses([_decode_utterance_record(r) for r in records if r['utterance_type'] == 'responses'])
+    
+    return speaker_info_obj
+
+
+def iter_jsonl_records(file):
+    
+    #stream the records one line at a time, .gz files are decompressed on the fly
+    with open_json_file(file, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _starts_new_write(record, records):
+    #a per-speaker record, a different speaker or utterance_index 0 starts a new write, otherwise the record belongs to the current one
+    if not records or 'utterance_type' not in record or 'utterance_type' not in records[0]:
+        return True
+    return _speaker_key(record) != _speaker_key(records[0]) or record['utterance_index'] == 0
+
+
+def iter_speakers_from_jsonl(file):
+    
+    """
+    Streams SpeakerInfo objects from a JSON Lines file written with write_jsonl()/save_to_jsonl(),
+    without loading the whole file into memory. The per-utterance records of one write of a speaker are grouped into one object.
+    If a speaker was written to the file more than once, every copy is yielded in file order, so the last one is the current one
+    (load_speaker_from_jsonl() only returns that one).
+
+    Input:
+        file (str): path to the .jsonl(.gz) file
+
+    Yields:
+        speaker_info: SpeakerInfo object
+    """
+    
+    records = []
+    for record in iter_jsonl_records(file):
+        if records and _starts_new_write(record, records):
+            yield decode_speaker_records(records)
+            records = []
+        records.append(record)
+    
+    if records:
+        yield decode_speaker_records(records)
+
+
+def _open_binary(file):
+    return gzip.open(file, 'rb') if file.endswith('.gz') else open(file, 'rb')
+
+
+#the key fields at the start of each compact record (see RECORD_KEY_FIELDS in speaker_info_encoder.py),
+#utterance_type is null for the empty record of a speaker without utterances
+_JSON_VALUE = rb'(?:"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?|null|true|false)'
+_RECORD_HEADER = re.compile(rb'\{"dyad":(' + _JSON_VALUE + rb'),"condition":(' + _JSON_VALUE + rb'),"speaker_ID":(' + _JSON_VALUE + rb')'
+                            rb'(?:,"utterance_type":' + _JSON_VALUE + rb',"utterance_index":(\d+))?')
+
+
+def _read_record_header(line):
+    #speaker key and utterance_index (None for per-speaker records) of a record, without parsing the whole line
+    match = _RECORD_HEADER.match(line)
+    if match is None:
+        record = json.loads(line)
+        return _speaker_key(record), record.get('utterance_index')
+    
+    dyad, condition, speaker_ID, utterance_index = match.groups()
+    key = (json.loads(dyad), json.loads(condition), json.loads(speaker_ID))
+    
+    return key, None if utterance_index is None else int(utterance_index)
+
+
+def index_jsonl(file):
+    
+    """
+    Scans a JSON Lines file once and records the byte offsets of the records of every speaker, so single speakers can be loaded later with a seek.
+    Only the key fields at the start of each line are read. If a speaker was written more than once, only the offsets of the last write are kept.
+    Seeking in .gz files works but has to decompress up to the offset.
+
+    Input:
+        file (str): path to the .jsonl(.gz) file
+
+    Returns:
+        index (dict): (dyad, condition, speaker_ID) -> list of byte offsets of the records of that speaker
+    """
+    
+    index = {}
+    with _open_binary(file) as f:
+        offset = f.tell()
+        for line in iter(f.readline, b''):
+            if line.strip():
+                key, utterance_index = _read_record_header(line)
+                if utterance_index is None or utterance_index == 0 or key not in index:
+                    index[key] = [offset]
+                else:
+                    index[key].append(offset)
+            offset = f.tell()
+    
+    return index
+
+
+def load_speaker_from_jsonl(file, dyad, condition, speaker_ID, index=None):
+    
+    """
+    Loads one speaker from a JSON Lines file by seeking to its records. Build the index once with index_jsonl()
+    and pass it in when loading several speakers, otherwise the file is scanned on every call.
+
+    Input:
+        file (str): path to the .jsonl(.gz) file
+        dyad, condition, speaker_ID: the speaker to load
+        index (dict): index as returned by index_jsonl(), built on the fly if not given
+
+    Raises:
+        KeyError: If the speaker is not in the file.
+
+    Returns:
+        speaker_info: SpeakerInfo object, from the last write of the speaker to the file
+    """
+    
+    if index is None:
+        index = index_jsonl(file)
+    
+    key = (dyad, condition, speaker_ID)
+    if key not in index:
+        raise KeyError(f'No records found for {dyad}_{condition}_{speaker_ID} in {file}')
+    
+    records = []
+    with _open_binary(file) as f:
+        for offset in index[key]:
+            f.seek(offset)
+            records.append(json.loads(f.readline()))
+    
+    return decode_speaker_records(records)
@@ -1,4 +1,5 @@
 import json
+import gzip
 
 """
 Encoder that can be passed to json.dump() under the `cls` flag.
@@ -11,4 +12,106 @@ class SpeakerInfoEncoder(json.JSONEncoder):
     def default(self, speaker_obj):
         return [speaker_obj.get_interval(),
         speaker_obj.get_overlaps()
-        ]
\ No newline at end of file
+        ]
+
+
+def open_json_file(file, mode, compress=False):
+    #files ending in .gz or with compress set are read/written with gzip
+    if compress or file.endswith('.gz'):
+        return gzip.open(file, mode + 't', encoding='utf-8')
+    return open(file, mode, encoding='utf-8')
+
+
+def stream_json(obj, f, compact=True):
+
+    """
+    Writes obj to the open file handle chunk by chunk using iterencode(), so the whole encoded string is never held in memory.
+
+    Input:
+        obj: object to encode, i.e. SpeakerInfo.__dict__
+        f: file handle opened in text mode
+        compact (bool): no indentation or whitespace between items, otherwise indent=4 as in the original output
+    """
+
+    if compact:
+        encoder = SpeakerInfoEncoder(ensure_ascii=False, separators=(',', ':'))
+    else:
+        encoder = SpeakerInfoEncoder(ensure_ascii=False, indent=4)
+
+    for chunk in encoder.iterencode(obj):
+        f.write(chunk)
+
+
+#every JSON Lines record starts with these fields in this order, so the decoder can index a file without parsing whole records
+RECORD_KEY_FIELDS = ['dyad', 'condition', 'speaker_ID']
+
+
+def get_speaker_record(speaker_obj):
+
+    """
+    The SpeakerInfo object as one record, with the key fields first.
+    """
+
+    record = {key: speaker_obj.__dict__[key] for key in RECORD_KEY_FIELDS}
+    record.update(speaker_obj.__dict__)
+
+    return record
+
+
+def get_utterance_records(speaker_obj):
+
+    """
+    Splits a SpeakerInfo object into one record per utterance, each carrying the speaker info it belongs to.
+    `utterance_index` counts the records of the speaker from 0, so the decoder can tell where a new write of the same speaker starts.
+    A speaker without any utterances is written as a single record with `utterance_type` None, so it isn't lost from the export.
+    """
+
+    speaker_fields = {key: speaker_obj.__dict__[key] for key in RECORD_KEY_FIELDS}
+    utterance_index = 0
+    for utterance_type in ['questions', 'responses']:
+        for utterance in speaker_obj.__dict__[utterance_type]:
+            yield dict(speaker_fields,
+                       utterance_type=utterance_type,
+                       utterance_index=utterance_index,
+                       linked_file=speaker_obj.__dict__['linked_file'],
+                       ID=utterance.get_ID(),
+                       interval=utterance.get_interval(),
+                       overlaps=utterance.get_overlaps())
+            utterance_index += 1
+
+    if utterance_index == 0:
+        yield dict(speaker_fields,
+                   utterance_type=None,
+                   utterance_index=0,
+                   linked_file=speaker_obj.__dict__['linked_file'])
+
+
+def write_jsonl(speaker_objs, out_file, per_utterance=False, compress=False):
+
+    """
+    Appends SpeakerInfo objects to a single JSON Lines file, one compact record per line.
+    Use this instead of save_to_json() for whole corpus runs to avoid writing one small file per speaker.
+    Writing a speaker that is already in the file appends a new copy, the decoder treats the last copy as the current one.
+
+    Input:
+        speaker_objs (list): SpeakerInfo objects
+        out_file (str): path of the .jsonl file, created if it doesn't exist
+        per_utterance (bool): write one record per utterance instead of one per speaker (speakers without utterances get one empty record)
+        compress (bool): gzip the output, `.gz` is appended to the filename if it's missing. Appending adds a new gzip member
+            which is read back transparently
+
+    Returns:
+        out_file (str): path of the file that was written to
+    """
+
+    if compress and not out_file.endswith('.gz'):
+        out_file += '.gz'
+
+    with open_json_file(out_file, 'a', compress) as f:
+        for speaker_obj in speaker_objs:
+            records = get_utterance_records(speaker_obj) if per_utterance else [get_speaker_record(speaker_obj)]
+            for record in records:
+                stream_json(record, f, compact=True)
+                f.write('\n')
+
+    return out_file
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+"""
+    Rasterized occupancy timelines for ELAN tiers.
+    A tier is turned into a boolean array with one bin per `resolution` ms (1 ms by default, or i.e. 1000/25 for a 25 fps video),
+    which is True wherever any annotation of the tier is active. An annotation marks every bin it touches: the start is floored and
+    the end is ceiled to the bin edges, so annotations shorter than one bin (i.e. short blinks at the video frame rate) are never dropped.
+    Overlap amounts between utterances and signal tiers, or between any two tiers, can then be computed in bulk with vectorized AND/OR
+    and sum operations instead of comparing every pair of intervals.
+"""
+
+#tolerance for float division, so a time exactly on a bin edge (i.e. 1001 ms at 1000/29.97) isn't pushed into the next bin
+_EPS = 1e-9
+
+def _to_bins(times, resolution):
+    #map times in ms onto bin indices of the timeline
+    return np.floor(np.asarray(times, dtype=float) / resolution + _EPS).astype(np.int64)
+
+
+def _interval_bins(intervals, resolution, n_bins):
+    #first and one-past-last bin of every interval, covering all the bins the interval touches
+    starts = _to_bins([iv[0] for iv in intervals], resolution)
+    ends = np.ceil(np.asarray([iv[1] for iv in intervals], dtype=float) / resolution - _EPS).astype(np.int64)
+
+    return np.clip(starts, 0, n_bins), np.clip(ends, 0, n_bins)
+
+
+def rasterize_intervals(intervals, n_bins, resolution=1):
+
+    """
+    Converts a list of intervals into a boolean occupancy timeline. Every bin the interval touches is marked,
+    only intervals without duration that lie exactly on a bin edge mark nothing.
+
+    Input:
+        intervals (list): (start, end, ...) tuples in ms, as returned by pympi
+        n_bins (int): length of the timeline
+        resolution (float): bin size in ms
+
+    Returns:
+        timeline (np.ndarray): boolean array, True where at least one interval is active
+    """
+
+    if len(intervals) == 0:
+        return np.zeros(n_bins, dtype=bool)
+
+    starts, ends = _interval_bins(intervals, resolution, n_bins)
+
+    #difference array: +1 at every onset, -1 at every offset, the cumulative sum counts the active intervals per bin
+    #overlapping intervals within the same tier are merged this way instead of being counted twice
+    diff = np.zeros(n_bins + 1, dtype=np.int32)
+    np.add.at(diff, starts, 1)
+    np.add.at(diff, ends, -1)
+
+    return np.cumsum(diff[:-1]) > 0
+
+
+def get_n_bins(eaf, resolution=1):
+
+    """
+    Number of bins needed to cover all annotations in the ELAN file at the given resolution.
+    """
+
+    end = max((iv[1] for tier in eaf.get_tier_names() for iv in eaf.get_annotation_data_for_tier(tier)), default=0)
+    return int(_to_bins(end, resolution)) + 1
+
+
+def rasterize_tier(eaf, tier, resolution=1, n_bins=None):
+
+    """
+    Converts one tier of an ELAN file into an occupancy timeline.
+
+    Input:
+        eaf (pympi.Eaf): loaded ELAN file
+        tier (str): tiername
+        resolution (float): bin size in ms
+        n_bins (int): length of the timeline, defaults to the end of the last annotation in the file
+
+    Raises:
+        KeyError: If the tier is not found in the ELAN file.
+
+    Returns:
+        timeline (np.ndarray): boolean occupancy array
+    """
+
+    if n_bins is None:
+        n_bins = get_n_bins(eaf, resolution)
+
+    try:
+        intervals = eaf.get_annotation_data_for_tier(tier)
+    except:
+        raise KeyError(f'The target tier {tier} was not found in the ELAN file')
+
+    return rasterize_intervals(intervals, n_bins, resolution)
+
+
+def rasterize_tiers(eaf, tierlist, resolution=1):
+
+    """
+    Converts all tiers in `tierlist` into occupancy timelines of the same length, so they can be combined with each other.
+
+    Returns:
+        timelines (dict): tiername -> boolean occupancy array
+    """
+
+    n_bins = get_n_bins(eaf, resolution)
+    return {tier: rasterize_tier(eaf, tier, resolution, n_bins) for tier in tierlist}
+
+
+def timeline_and(*timelines):
+    #bins in which all timelines are active
+    return np.logical_and.reduce(timelines)
+
+
+def timeline_or(*timelines):
+    #bins in which any of the timelines is active
+    return np.logical_or.reduce(timelines)
+
+
+def occupied_duration(timeline, resolution=1):
+    #total active time in ms
+    return int(np.count_nonzero(timeline)) * resolution
+
+
+def overlap_duration(timeline_a, timeline_b, resolution=1):
+
+    """
+    Total time in ms in which both timelines are active.
+    """
+
+    return occupied_duration(timeline_and(timeline_a, timeline_b), resolution)
+
+
+def interval_overlap_durations(intervals, timeline, resolution=1):
+
+    """
+    Overlap in ms between each interval and the timeline, for all intervals at once.
+    A prefix sum over the timeline means each interval only needs two lookups, regardless of its length.
+    The intervals are binned the same way as the timeline, so at resolutions above 1 ms the result is in whole bins.
+
+    Input:
+        intervals (list): (start, end) tuples in ms, i.e. UtteranceInfo.get_interval() for all utterances
+        timeline (np.ndarray): boolean occupancy array
+        resolution (float): bin size in ms
+
+    Returns:
+        durations (np.ndarray): overlap in ms for each interval
+    """
+
+    if len(intervals) == 0:
+        return np.zeros(0)
+
+    prefix = np.concatenate(([0], np.cumsum(timeline, dtype=np.int64)))
+    starts, ends = _interval_bins(intervals, resolution, len(timeline))
+
+    return (prefix[ends] - prefix[starts]) * resolution
+
+
+def interval_overlap_percentages(intervals, timeline, resolution=1):
+
+    """
+    Same as interval_overlap_durations(), but relative to the interval duration (dur_overlap / dur_interval * 100),
+    matching the `prct` columns used for plotting. The duration is taken in bins as well, so 100% is the upper bound.
+    Intervals without duration get 0.
+    """
+
+    if len(intervals) == 0:
+        return np.zeros(0)
+
+    starts, ends = _interval_bins(intervals, resolution, len(timeline))
+    durations = ((ends - starts) * resolution).astype(float)
+    overlaps = interval_overlap_durations(intervals, timeline, resolution)
+
+    return np.divide(overlaps * 100.0, durations, out=np.zeros_like(durations), where=durations > 0)
+
+
+def overlap_matrix(timelines, resolution=1):
+
+    """
+    Pairwise overlap in ms between all timelines, counted exactly on the boolean arrays without copying them into a larger dtype.
+    The diagonal holds the total occupied time of each tier.
+
+    Input:
+        timelines (dict): tiername -> boolean occupancy array, all of the same length
+
+    Returns:
+        matrix (pd.DataFrame): tier x tier overlap durations in ms
+    """
+
+    tiers = list(timelines.keys())
+    counts = np.zeros((len(tiers), len(tiers)), dtype=np.int64)
+    for i, tier_a in enumerate(tiers):
+        for j in range(i, len(tiers)):
+            #the matrix is symmetric, so only the upper triangle is counted
+            counts[i, j] = counts[j, i] = np.count_nonzero(timelines[tier_a] & timelines[tiers[j]])
+    matrix = counts * resolution
+
+    return pd.DataFrame(matrix, index=tiers, columns=tiers)
+
+
+def run_length_encode(timeline):
+
+    """
+    Compact representation of a timeline as the (start_bin, end_bin) of every active run.
+    """
+
+    padded = np.concatenate(([False], timeline, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+
+    return edges.reshape(-1, 2)
+
+
+def run_length_decode(runs, n_bins):
+
+    """
+    Reverses run_length_encode().
+    """
+
+    return rasterize_intervals(runs, n_bins, resolution=1)
+
+
+def pack_timeline(timeline):
+    #bit-packed timeline, 8 bins per byte
+    return np.packbits(timeline)
+
+
+def unpack_timeline(packed, n_bins):
+    #reverses pack_timeline()
+    return np.unpackbits(packed, count=n_bins).astype(bool)
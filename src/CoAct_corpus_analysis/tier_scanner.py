@@ -0,0 +1,176 @@
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+
+"""
+    Pre-flight check of the tiers in the corpus. Only the TIER headers (id, participant, linguistic type) of each `.eaf` file are read,
+    annotations are skipped, so a misnamed or missing tier is found for the whole corpus in seconds instead of after a full extraction run.
+"""
+
+class TierCheckError(KeyError):
+
+    """
+        Raised when requested tiers are missing from the corpus. Still a KeyError like the errors of the extraction functions,
+        but printed as is, so the report shows one problem per line.
+    """
+
+    def __str__(self):
+        return str(self.args[0])
+
+
+def read_tier_headers(eaf_file):
+
+    """
+    Reads the TIER headers of an ELAN file without parsing its annotations.
+
+    Input:
+        eaf_file (str): path to the `.eaf` file
+
+    Returns:
+        headers (dict): TIER_ID -> dict with PARTICIPANT, LINGUISTIC_TYPE_REF and PARENT_REF of the tier
+    """
+
+    headers = {}
+    for event, elem in ET.iterparse(eaf_file, events=('start', 'end')):
+        if event == 'start' and elem.tag == 'TIER':
+            headers[elem.get('TIER_ID')] = {'PARTICIPANT': elem.get('PARTICIPANT', ''),
+                                            'LINGUISTIC_TYPE_REF': elem.get('LINGUISTIC_TYPE_REF', ''),
+                                            'PARENT_REF': elem.get('PARENT_REF', '')}
+        elif event == 'end' and elem.tag in ('ANNOTATION', 'TIER'):
+            #drop the annotations right away, they are not needed for the check
+            elem.clear()
+
+    return headers
+
+
+def _scan_file(eaf_file):
+    #returns the tiernames of the file or the error message if the file can't be read
+    try:
+        return set(read_tier_headers(eaf_file)), None
+    except (OSError, ET.ParseError) as e:
+        return set(), f'{type(e).__name__}: {e}'
+
+
+def _get_file_errors(found, read_error, tierlist):
+    #list of problems for one file, empty if all tiers are present
+    if read_error:
+        return [read_error]
+    return [f'missing tier {tier}' for tier in tierlist if tier not in found]
+
+
+def scan_files(file_tiers, max_workers=None, use_processes=False):
+
+    """
+    Checks for every file which of its requested tiers are present, reading the files in parallel.
+
+    Input:
+        file_tiers (dict): path to the `.eaf` file -> list of full tiernames to check for in that file
+        max_workers (int): size of the thread/process pool, defaults to the executor default
+        use_processes (bool): use a process pool instead of a thread pool
+
+    Returns:
+        availability (pd.DataFrame): file x tier matrix over all requested tiers, True if the tier exists in the file
+        errors (dict): file -> list of problems (missing tiers or read errors), only for files with problems
+    """
+
+    eaf_files = list(file_tiers)
+    executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor(max_workers=max_workers) as pool:
+        results = list(pool.map(_scan_file, eaf_files))
+
+    all_tiers = list(dict.fromkeys(tier for tierlist in file_tiers.values() for tier in tierlist))
+    availability = pd.DataFrame([[tier in found for tier in all_tiers] for found, _ in results],
+                                index=eaf_files, columns=all_tiers)
+
+    errors = {}
+    for eaf_file, (found, read_error) in zip(eaf_files, results):
+        problems = _get_file_errors(found, read_error, file_tiers[eaf_file])
+        if problems:
+            errors[eaf_file] = problems
+
+    return availability, errors
+
+
+def scan_corpus(eaf_files, tierlist, max_workers=None, use_processes=False):
+
+    """
+    Same as scan_files(), but checks all files for the same tiers.
+
+    Input:
+        eaf_files (list): paths to the `.eaf` files
+        tierlist (list): full tiernames to check for, i.e. ['Question_A', 'Question_B', 'Gaze_A']
+    """
+
+    return scan_files({eaf_file: tierlist for eaf_file in eaf_files}, max_workers, use_processes)
+
+
+def format_error_report(errors):
+    #one line per problem, grouped by file
+    return '\n'.join(f'{eaf_file}: {problem}' for eaf_file, problems in errors.items() for problem in problems)
+
+
+def _raise_on_errors(errors, n_files):
+    if errors:
+        raise TierCheckError(f'Tier check failed for {len(errors)} of {n_files} files:\n{format_error_report(errors)}')
+
+
+def check_file(eaf_file, tierlist):
+
+    """
+    Checks a single file for the given tiers, without starting a thread pool.
+
+    Raises:
+        TierCheckError: If any of the tiers in `tierlist` are not found in the file or it can't be read, listing all the problems at once.
+    """
+
+    found, read_error = _scan_file(eaf_file)
+    problems = _get_file_errors(found, read_error, tierlist)
+    _raise_on_errors({eaf_file: problems} if problems else {}, 1)
+
+
+def check_corpus(eaf_files, tierlist, max_workers=None, use_processes=False):
+
+    """
+    Same as scan_corpus(), but fails before any extraction work is done if a tier is missing anywhere in the corpus.
+
+    Raises:
+        TierCheckError: If any of the tiers in `tierlist` are not found in any of the files, listing all the problems at once.
+
+    Returns:
+        availability (pd.DataFrame): file x tier matrix, True if the tier exists in the file
+    """
+
+    availability, errors = scan_corpus(eaf_files, tierlist, max_workers, use_processes)
+    _raise_on_errors(errors, len(availability))
+
+    return availability
+
+
+def check_speakers(speaker_infos, speaker_specific_tiers=(), tierlist=(), max_workers=None, use_processes=False):
+
+    """
+    Pre-flight check for a whole extraction run: call this once with all the SpeakerInfo objects before extracting anything.
+    The tiers each speaker needs are collected per linked file, so both speakers of a dyad are checked in one read of the file.
+
+    Input:
+        speaker_infos (list): SpeakerInfo objects
+        speaker_specific_tiers (list): tiernames without the speaker appendix, i.e. ['Question', 'Gaze'] is checked as Question_A, Gaze_A for speaker A
+        tierlist (list): full tiernames that are checked for every speaker as is
+
+    Raises:
+        TierCheckError: If any of the tiers are not found in the linked files or a file can't be read, listing all the problems at once.
+
+    Returns:
+        availability (pd.DataFrame): file x tier matrix, True if the tier exists in the file
+    """
+
+    file_tiers = {}
+    for speaker_info in speaker_infos:
+        speaker_tiers = ['_'.join([tier, speaker_info.get_speaker_ID()]) for tier in speaker_specific_tiers]
+        file_tiers.setdefault(speaker_info.linked_file, []).extend(speaker_tiers + list(tierlist))
+
+    file_tiers = {eaf_file: list(dict.fromkeys(tiers)) for eaf_file, tiers in file_tiers.items()}
+    availability, errors = scan_files(file_tiers, max_workers, use_processes)
+    _raise_on_errors(errors, len(availability))
+
+    return availability
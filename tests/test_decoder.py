@@ -1,9 +1,10 @@
 import os
 import glob
 import json
+import tempfile
 from CoAct_corpus_analysis.speaker_info import SpeakerInfo
 from CoAct_corpus_analysis.utterance_info import UtteranceInfo
-from CoAct_corpus_analysis.speaker_info_decoder import load_speaker_from_json
+from CoAct_corpus_analysis.speaker_info_decoder import load_speaker_from_json, iter_speakers_from_jsonl, load_speaker_from_jsonl, index_jsonl
 
 
 test_output_dir = os.path.join('/data', 'workspaces', 'cosi','workspaces','cosi-coact',
@@ -16,4 +17,77 @@ for test_file in test_files:
     speaker_info = load_speaker_from_json(file = test_file)
     assert isinstance(speaker_info, SpeakerInfo), 'Object not decoded as correct type!'
     assert all(isinstance(x, UtteranceInfo) for x in speaker_info.get_questions()), 'Questions not decoded properly!'
-    assert all(isinstance(x, UtteranceInfo) for x in speaker_info.get_responses()), 'Responses not decoded properly!'
\ No newline at end of file
+    assert all(isinstance(x, UtteranceInfo) for x in speaker_info.get_responses()), 'Responses not decoded properly!'
+
+
+#the fixtures that ship with the repo, two speakers
+fixture_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_output')
+fixture_files = sorted(glob.glob(os.path.join(fixture_dir, '*.json')))
+
+
+def utterance_data(speaker_info):
+    #intervals and overlaps of all utterances, normalized the same way as after a JSON round trip
+    return json.loads(json.dumps([[u.get_ID(), u.get_interval(), u.get_overlaps()] for u in speaker_info.get_questions() + speaker_info.get_responses()]))
+
+
+def test_compact_compressed_json():
+
+    assert fixture_files, 'No test fixtures found!'
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fixture_file in fixture_files:
+            speaker_info = load_speaker_from_json(file = fixture_file)
+            speaker_info.save_to_json(tmp_dir, compact=True, compress=True)
+            
+            out_file = os.path.join(tmp_dir, f'{speaker_info.get_dyad()}_{speaker_info.get_condition()}_{speaker_info.get_speaker_ID()}_data.json.gz')
+            assert os.path.isfile(out_file), 'Compressed file not written!'
+            assert utterance_data(load_speaker_from_json(file = out_file)) == utterance_data(speaker_info), 'Compressed file not decoded properly!'
+
+
+def test_jsonl_round_trip():
+
+    #write all fixtures to one JSON Lines file per speaker and per utterance and check that they decode to the same speakers
+    speakers = [load_speaker_from_json(file = fixture_file) for fixture_file in fixture_files]
+    assert len(speakers) == 2, 'Test fixtures not found!'
+    
+    #a speaker without any utterances has to survive the per-utterance export as well
+    speakers.insert(1, SpeakerInfo(dyad='02', speaker_ID='A', condition='task2', linked_file='02_task2.eaf'))
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for per_utterance in [False, True]:
+            for compress in [False, True]:
+                jsonl_file = os.path.join(tmp_dir, f'corpus_{per_utterance}_{compress}.jsonl')
+                for speaker_info in speakers:
+                    out_file = speaker_info.save_to_jsonl(jsonl_file, per_utterance=per_utterance, compress=compress)
+                
+                decoded = list(iter_speakers_from_jsonl(out_file))
+                assert len(decoded) == len(speakers), 'Not all speakers decoded from JSON Lines!'
+                for speaker_info, decoded_info in zip(speakers, decoded):
+                    assert (decoded_info.get_dyad(), decoded_info.get_condition(), decoded_info.get_speaker_ID()) == \
+                           (speaker_info.get_dyad(), speaker_info.get_condition(), speaker_info.get_speaker_ID()), 'Speakers decoded out of order!'
+                    assert utterance_data(decoded_info) == utterance_data(speaker_info), 'Speaker not decoded properly from JSON Lines!'
+                
+                for speaker_info in speakers:
+                    loaded_info = load_speaker_from_jsonl(out_file, speaker_info.get_dyad(), speaker_info.get_condition(), speaker_info.get_speaker_ID())
+                    assert utterance_data(loaded_info) == utterance_data(speaker_info), 'Speaker not loaded properly from JSON Lines!'
+
+
+def test_jsonl_rewrite():
+
+    #writing the same speaker again appends a new copy, loading returns only the last one instead of merging them
+    speaker_info = load_speaker_from_json(file = fixture_files[0])
+    n_questions = len(speaker_info.get_questions())
+    assert n_questions, 'No questions in the test fixture!'
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for per_utterance in [False, True]:
+            jsonl_file = os.path.join(tmp_dir, f'corpus_{per_utterance}.jsonl.gz')
+            for _ in range(2):
+                speaker_info.save_to_jsonl(jsonl_file, per_utterance=per_utterance, compress=True)
+            
+            decoded = list(iter_speakers_from_jsonl(jsonl_file))
+            assert [len(x.get_questions()) for x in decoded] == [n_questions, n_questions], 'Copies of the same speaker merged!'
+            
+            index = index_jsonl(jsonl_file)
+            loaded_info = load_speaker_from_jsonl(jsonl_file, speaker_info.get_dyad(), speaker_info.get_condition(), speaker_info.get_speaker_ID(), index)
+            assert len(loaded_info.get_questions()) == n_questions, 'Copies of the same speaker merged!'
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import pandas as pd
+from CoAct_corpus_analysis.CoAct_corpus_plotting.figure_cache import get_figure_key, is_cached, record_figure, load_index
+
+#plotting_df as generated by the plot_preprocessing functions, including tuple columns from literal_eval
+plotting_df = pd.DataFrame({'tier': ['Gaze', 'Blink', 'Eyebrows'],
+                            'overlap_label': ['away', 'blink', 'raise'],
+                            'overlap_prct': [50.0, 12.5, 100.0],
+                            'label_on_offset': [(100, 300), (150, 200), (0, 400)]})
+
+
+def test_figure_key():
+
+    key = get_figure_key('plot_percentual_overlap', plotting_df, sa='FS')
+    assert key == get_figure_key('plot_percentual_overlap', plotting_df.copy(), sa='FS'), 'Key differs for the same data!'
+
+    changed_df = plotting_df.copy()
+    changed_df.loc[1, 'overlap_prct'] = 25.0
+    assert key != get_figure_key('plot_percentual_overlap', changed_df, sa='FS'), 'Key unchanged for different data!'
+    assert key != get_figure_key('plot_percentual_overlap', plotting_df, sa='INF'), 'Key unchanged for a different parameter!'
+    assert key != get_figure_key('plot_facial_signal_frequency', plotting_df, sa='FS'), 'Key unchanged for a different plot!'
+
+
+def test_figure_key_ignores_row_index():
+
+    #rows of other social actions added or removed earlier in the corpus shift the index of the slice, but not the figure
+    question_df = pd.DataFrame({'1_SA_category': ['FS', 'FS', 'INF'], '1_SA_type': ['ACK', 'CON', 'REP']})
+    fs_df = question_df[question_df['1_SA_category'] == 'FS']
+    key = get_figure_key('plot_frequency', fs_df[['1_SA_type']], tier='1_SA_type', sa='FS')
+
+    prepended_df = pd.concat([pd.DataFrame({'1_SA_category': ['INF'], '1_SA_type': ['REP']}), question_df], ignore_index=True)
+    prepended_fs_df = prepended_df[prepended_df['1_SA_category'] == 'FS']
+    assert list(prepended_fs_df.index) != list(fs_df.index)
+    assert key == get_figure_key('plot_frequency', prepended_fs_df[['1_SA_type']], tier='1_SA_type', sa='FS'), 'Key changed for unrelated rows!'
+
+    assert key == get_figure_key('plot_frequency', fs_df[['1_SA_type']].reset_index(drop=True), tier='1_SA_type', sa='FS'), 'Key changed for a new index!'
+
+    #the tier labels of a co-occurrence matrix are drawn, so they are passed as a parameter and do change the key
+    matrix = pd.DataFrame([[2, 1], [1, 3]], index=['Gaze', 'Blink'], columns=['Gaze', 'Blink'])
+    relabeled = matrix.rename(index={'Gaze': 'Squint'})
+    assert get_figure_key('plot_cooccurrence_matrix', matrix, sa='FS', tiers=list(matrix.index)) != \
+           get_figure_key('plot_cooccurrence_matrix', relabeled, sa='FS', tiers=list(relabeled.index)), 'Key unchanged for different tier labels!'
+
+
+def test_record_figure():
+
+    key = get_figure_key('plot_percentual_overlap', plotting_df, sa='FS')
+    other_key = get_figure_key('plot_percentual_overlap', plotting_df, sa='INF')
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_file = os.path.join(out_dir, 'FS_Overlap_amounts.png')
+        assert not is_cached(out_file, key), 'Figure cached before it was rendered!'
+
+        with open(out_file, 'w') as f:
+            f.write('png')
+        assert not is_cached(out_file, key), 'Figure cached before it was recorded!'
+
+        record_figure(out_file, key)
+        assert is_cached(out_file, key), 'Figure not cached after it was recorded!'
+        assert not is_cached(out_file, other_key), 'Figure cached for a different key!'
+        assert list(load_index(out_dir)) == ['FS_Overlap_amounts.png']
+        assert sorted(os.listdir(out_dir)) == ['FS_Overlap_amounts.png', 'figure_index.json'], 'Temporary index file left behind!'
+
+        os.remove(out_file)
+        assert not is_cached(out_file, key), 'Figure cached after the file was removed!'
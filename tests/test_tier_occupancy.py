@@ -0,0 +1,79 @@
+import os
+import numpy as np
+from CoAct_corpus_analysis.speaker_info import SpeakerInfo
+from CoAct_corpus_analysis import tier_occupancy
+
+#working dir
+working_dir = os.path.dirname(os.path.abspath(__file__))
+eaf_file = os.path.join(working_dir, 'test_input.eaf')
+
+signal_tiers = ['Gaze_A', 'Blink_A', 'Eyebrows_A', 'Response_B']
+
+
+def test_overlap_amounts_match_pairwise_sum():
+
+    """
+        At 1 ms the bulk overlap amounts have to match the pairwise sum over the overlapping intervals as extracted by pympi.
+    """
+
+    speaker_info = SpeakerInfo(dyad='01', speaker_ID='A', condition='task1', linked_file=eaf_file)
+    questions = speaker_info.extract_utterances(tier='Question')
+    assert questions, 'No questions extracted!'
+
+    overlap_amounts = speaker_info.extract_utterance_overlap_amounts(questions, signal_tiers, resolution=1)
+    questions = speaker_info.extract_utterance_overlaps(questions, signal_tiers)
+
+    for i, question in enumerate(questions):
+        start, end = question.get_interval()
+        for tier in signal_tiers:
+            pairwise = sum(max(0, min(end, iv[1]) - max(start, iv[0])) for iv in question.get_overlaps()[tier])
+            assert overlap_amounts[tier][i] == pairwise, f'Incorrect overlap amount for question {i + 1} and {tier}: {overlap_amounts[tier][i]} instead of {pairwise}'
+
+
+def test_non_integer_resolution():
+
+    resolution = 1000 / 29.97
+    speaker_info = SpeakerInfo(dyad='01', speaker_ID='A', condition='task1', linked_file=eaf_file)
+    questions = speaker_info.extract_utterances(tier='Question')
+    intervals = [question.get_interval() for question in questions]
+
+    timelines = speaker_info.extract_tier_timelines(['Question_A'] + signal_tiers, resolution=resolution)
+    assert len(set(len(timeline) for timeline in timelines.values())) == 1, 'Timelines differ in length!'
+
+    #every question overlaps itself completely, and never by more than 100%
+    self_prct = tier_occupancy.interval_overlap_percentages(intervals, timelines['Question_A'], resolution)
+    assert np.allclose(self_prct, 100.0), f'Self overlap should be 100% but is {self_prct}'
+    for tier in signal_tiers:
+        prct = tier_occupancy.interval_overlap_percentages(intervals, timelines[tier], resolution)
+        assert ((prct >= 0) & (prct <= 100)).all(), f'Overlap percentages out of range for {tier}'
+
+    #the diagonal of the overlap matrix is the occupied time of each tier, the rest the pairwise overlap
+    matrix = tier_occupancy.overlap_matrix(timelines, resolution)
+    for tier, timeline in timelines.items():
+        assert np.isclose(matrix.loc[tier, tier], tier_occupancy.occupied_duration(timeline, resolution))
+        for other_tier, other_timeline in timelines.items():
+            assert np.isclose(matrix.loc[tier, other_tier], tier_occupancy.overlap_duration(timeline, other_timeline, resolution))
+
+
+def test_short_intervals_are_kept():
+
+    #an annotation shorter than one bin marks the bin it falls into
+    timeline = tier_occupancy.rasterize_intervals([(10, 30)], 10, 40)
+    assert timeline.tolist() == [True] + [False] * 9, 'Annotation within one bin dropped!'
+
+    #an annotation across a bin edge marks both bins
+    timeline = tier_occupancy.rasterize_intervals([(30, 50)], 10, 40)
+    assert timeline.tolist() == [True, True] + [False] * 8, 'Annotation across a bin edge not marked in both bins!'
+
+
+def test_run_length_and_packed_round_trip():
+
+    speaker_info = SpeakerInfo(dyad='01', speaker_ID='A', condition='task1', linked_file=eaf_file)
+    for resolution in [1, 1000 / 25, 1000 / 29.97]:
+        timelines = speaker_info.extract_tier_timelines(signal_tiers, resolution=resolution)
+        for tier, timeline in timelines.items():
+            runs = tier_occupancy.run_length_encode(timeline)
+            assert (tier_occupancy.run_length_decode(runs, len(timeline)) == timeline).all(), f'Run-length round trip failed for {tier}'
+
+            packed = tier_occupancy.pack_timeline(timeline)
+            assert (tier_occupancy.unpack_timeline(packed, len(timeline)) == timeline).all(), f'Bit-packed round trip failed for {tier}'
@@ -0,0 +1,72 @@
+import os
+import tempfile
+from CoAct_corpus_analysis.speaker_info import SpeakerInfo
+from CoAct_corpus_analysis.tier_scanner import read_tier_headers, scan_corpus, check_corpus, check_speakers, TierCheckError
+
+#working dir
+working_dir = os.path.dirname(os.path.abspath(__file__))
+eaf_file = os.path.join(working_dir, 'test_input.eaf')
+
+
+def test_tier_headers():
+
+    headers = read_tier_headers(eaf_file)
+    for tier in ['Question_A', 'Question_B', 'Response_A', 'Response_B', 'Gaze_A']:
+        assert tier in headers, f'Tier {tier} not read from the file!'
+
+
+def test_present_missing_and_unreadable():
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        broken_file = os.path.join(tmp_dir, 'test_input.eaf') #same filename as the test file, in a different folder
+        with open(broken_file, 'w') as f:
+            f.write('<ANNOTATION_DOCUMENT><TIER TIER_ID="Gaze_A">')
+        missing_file = os.path.join(tmp_dir, 'missing.eaf')
+
+        availability, errors = scan_corpus([eaf_file, broken_file, missing_file], ['Question_A', 'Gaze_A', 'Misnamed_A'])
+
+    assert list(availability.index) == [eaf_file, broken_file, missing_file], 'Files with the same name collide in the availability matrix!'
+    assert availability.loc[eaf_file, 'Question_A'] and availability.loc[eaf_file, 'Gaze_A'], 'Present tiers not found!'
+    assert not availability.loc[eaf_file, 'Misnamed_A'], 'Missing tier reported as present!'
+    assert not availability.loc[missing_file].any(), 'Tiers reported for a file that does not exist!'
+
+    assert errors[eaf_file] == ['missing tier Misnamed_A'], f'Incorrect error for the test file: {errors[eaf_file]}'
+    assert errors[broken_file][0].startswith('ParseError'), f'Incorrect error for the broken file: {errors[broken_file]}'
+    assert errors[missing_file][0].startswith('FileNotFoundError'), f'Incorrect error for the missing file: {errors[missing_file]}'
+
+
+def test_check_raises_readable_report():
+
+    assert check_corpus([eaf_file], ['Question_A', 'Question_B']).all(axis=None), 'Present tiers not found!'
+
+    try:
+        check_corpus([eaf_file], ['Question_A', 'Misnamed_A', 'Misnamed_B'])
+    except KeyError as e:
+        report = str(e)
+    else:
+        assert False, 'No error raised for missing tiers!'
+
+    #one line per problem, not a repr with literal \n
+    assert report.splitlines()[1:] == [f'{eaf_file}: missing tier Misnamed_A', f'{eaf_file}: missing tier Misnamed_B'], f'Incorrect report: {report}'
+
+
+def test_check_speakers():
+
+    speaker_infos = [SpeakerInfo(dyad='01', speaker_ID=speaker, condition='task1', linked_file=eaf_file) for speaker in ['A', 'B']]
+
+    availability = check_speakers(speaker_infos, speaker_specific_tiers=['Question', 'Response', 'Gaze'])
+    assert list(availability.columns) == ['Question_A', 'Response_A', 'Gaze_A', 'Question_B', 'Response_B', 'Gaze_B']
+
+    try:
+        check_speakers(speaker_infos, speaker_specific_tiers=['Question', 'Misnamed'])
+    except TierCheckError as e:
+        assert 'missing tier Misnamed_A' in str(e) and 'missing tier Misnamed_B' in str(e), f'Incorrect report: {e}'
+    else:
+        assert False, 'No error raised for missing tiers!'
+
+    try:
+        speaker_infos[0].check_tiers(['Question_A', 'Misnamed_A'])
+    except TierCheckError as e:
+        assert 'missing tier Misnamed_A' in str(e), f'Incorrect report: {e}'
+    else:
+        assert False, 'No error raised for missing tiers!'